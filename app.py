@@ -1,16 +1,12 @@
 import streamlit as st
-from pathlib import Path
+import os
+import importlib
+import threading
 
-# Page configuration
-st.set_page_config(
-    page_title="Engineering AI Assistant",
-    page_icon="👷‍♂️",
-    layout="wide",
-    initial_sidebar_state="expanded"
-)
+from utils.navigation import render_sidebar
 
 # Hide default page navigation and add custom styling
-st.markdown("""
+_CSS = """
 <style>
     /* Hide default streamlit page navigation */
     [data-testid="stSidebarNav"] {
@@ -81,20 +77,67 @@ st.markdown("""
         margin-top: 0;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+# Page configuration
+st.set_page_config(
+    page_title="Engineering AI Assistant",
+    page_icon="👷‍♂️",
+    layout="wide",
+    initial_sidebar_state="expanded"
+)
+
+st.markdown(_CSS, unsafe_allow_html=True)
+
+
+def _dir_has_entry(path):
+    """True if path is a directory with at least one entry (one scandir, no listing)"""
+    try:
+        with os.scandir(path) as entries:
+            return next(entries, None) is not None
+    except OSError:
+        return False
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def check_system_status():
+    """Check vector database, manual, and API key (re-checked at most every 30s)"""
+    # Check vector database
+    vector_ready = _dir_has_entry("vectorstore")
+    
+    # Check manual file
+    manual_ready = _dir_has_entry("data")
+    
+    # Check API (we'll assume it's configured if secrets exist)
+    try:
+        api_ready = bool(st.secrets.get("CLAUDE_API_KEY"))
+    except Exception:
+        api_ready = False
+    
+    return {
+        "vector_ready": vector_ready,
+        "manual_ready": manual_ready,
+        "api_ready": api_ready
+    }
 
-# Custom Sidebar Navigation (Admin Panel removed)
-st.sidebar.title("🧭 Navigation")
-st.sidebar.markdown("---")
 
-# Navigation buttons using page_link - only Dashboard, Q&A, and Wizard
-st.sidebar.page_link("app.py", label="🏡 Dashboard", icon=None)
-st.sidebar.page_link("pages/1_QA_Mode.py", label="💬 Q&A Mode", icon=None)
-st.sidebar.page_link("pages/2_Wizard_Mode.py", label="🧙‍♂️ Wizard Mode", icon=None)
+@st.cache_resource
+def _warm_qa_deps():
+    """Import the Q&A page's modules in the background, once per process"""
+    def _import_modules():
+        for module_name in ("utils.rag_engine", "utils.database", "utils.google_sheets"):
+            try:
+                importlib.import_module(module_name)
+            except Exception as e:
+                print(f"Warning: could not preload {module_name}: {e}")
+    
+    thread = threading.Thread(target=_import_modules, name="qa-preload", daemon=True)
+    thread.start()
+    return thread
+
 
-st.sidebar.markdown("---")
-st.sidebar.markdown("**Engineering AI Assistant**")
-st.sidebar.markdown("v1.0 | Brentwood, TN")
+# Custom Sidebar Navigation
+render_sidebar()
 
 # Main content
 st.markdown("""
@@ -164,34 +207,22 @@ with st.expander("📚 Quick Start Guide"):
 with st.expander("📊 System Status (Developer Info)"):
     col1, col2, col3 = st.columns(3)
     
-    # Check vector database
-    vectorstore_path = Path("vectorstore")
-    vector_ready = vectorstore_path.exists()
-    
-    # Check manual file
-    data_path = Path("data")
-    manual_ready = data_path.exists()
-    
-    # Check API (we'll assume it's configured if secrets exist)
-    try:
-        api_ready = bool(st.secrets.get("CLAUDE_API_KEY"))
-    except:
-        api_ready = False
+    status = check_system_status()
     
     with col1:
-        if vector_ready:
+        if status["vector_ready"]:
             st.success("✅ **Vector Database**\n\nReady for searching")
         else:
             st.warning("⚠️ **Vector Database**\n\nNot initialized")
     
     with col2:
-        if manual_ready:
+        if status["manual_ready"]:
             st.success("✅ **Engineering Manual**\n\nAvailable for reference")
         else:
             st.warning("⚠️ **Engineering Manual**\n\nNot found")
     
     with col3:
-        if api_ready:
+        if status["api_ready"]:
             st.success("✅ **Claude API**\n\nConfigured and ready")
         else:
             st.error("❌ **Claude API**\n\nNot configured")
@@ -204,3 +235,6 @@ st.markdown(
     "</div>",
     unsafe_allow_html=True
 )
+
+# Preload Q&A dependencies while the user is on the dashboard
+_warm_qa_deps()
@@ -14,20 +14,22 @@ Update Log:
 """
 
 import streamlit as st
-import sys
-from pathlib import Path
+import html
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
 
-# Add utils to path so Python can find our helper files
-sys.path.append(str(Path(__file__).parent.parent / "utils"))
+import numpy as np
 
-from rag_engine import RAGEngine
-from database import AuditLogger
-from google_sheets import log_flagged_response
+from utils.navigation import render_sidebar
 
-st.set_page_config(page_title="Q&A Mode", page_icon="💬", layout="wide")
+# The heavy utils modules (Chroma, Anthropic, gspread) are imported where they
+# are first used, so visiting this page doesn't load them until they are needed
 
 # CSS styling for professional appearance
-st.markdown("""
+_CSS = """
 <style>
     /* Hide default streamlit page navigation */
     [data-testid="stSidebarNav"] {
@@ -41,14 +43,6 @@ st.markdown("""
         padding: 1rem;
         margin: 1rem 0;
     }
-    .answer-box {
-        background: #e7f3ff !important;
-        color: #1a1a2e !important;
-        border: 1px solid #bee5eb;
-        border-radius: 8px;
-        padding: 1rem;
-        margin: 1rem 0;
-    }
     .source-box {
         background: #fff3cd !important;
         color: #1a1a2e !important;
@@ -75,17 +69,354 @@ st.markdown("""
         margin: 1rem 0;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+# Static page text, built once at import
+_USAGE_TIPS_MD = """
+**Ask specific questions:**
+- "What are the setback requirements?"
+- "What is the max encroachment into PUDE?"
+- "What permits are needed for pools?"
+
+**The system will:**
+- Search the engineering manual
+- Provide cited answers
+- Show source locations
+- Abstain if no relevant info found
+
+**Report issues that are:**
+- Incorrect or misleading
+- Missing important details
+- Not relevant to your question
+"""
+
+_NOT_READY_MD = """
+- Vector database exists in `vectorstore/` folder
+- Claude API key is configured in secrets
+"""
+
+# Answer markdown, shown inside a bordered st.container
+_ANSWER_TEMPLATE = '**{answer}**{details}{code_reference}'
+_DETAILS_TEMPLATE = '\n\n{items}'
+_DETAIL_ITEM_TEMPLATE = '- {text}\n'
+_CODE_REFERENCE_TEMPLATE = '\n\n*Code Reference: {code_reference}*'
+
+# Characters that would otherwise be read as markdown (or LaTeX, for $)
+_MARKDOWN_SPECIAL_RE = re.compile(r'([\\`*_\[\]<>$~|#])')
+
+# CODE REFERENCE values that mean "none given" (compared lowercased)
+_NO_CODE_REFERENCE = {'', 'n/a', 'na', 'none', 'see sources below'}
+
+_SOURCE_TEMPLATE = (
+    '<div class="source-box"><strong>Source {num}:</strong> {source_file} (Chunk {chunk_id})'
+    '<br><small>Similarity: {similarity:.3f}</small></div>'
+)
+
+st.set_page_config(page_title="Q&A Mode", page_icon="💬", layout="wide")
+
+st.markdown(_CSS, unsafe_allow_html=True)
+
+# Custom Sidebar Navigation
+render_sidebar()
+
+
+# Per-user state kept between reruns
+SESSION_DEFAULTS = {
+    'current_result': None,
+    'current_question': "",
+    'show_feedback_form': False,
+    'feedback_submitted': False
+}
+
+# Keys dropped by the Clear button, including the question/feedback widget state
+CLEARED_KEYS = ('current_result', 'current_question', 'show_feedback_form',
+                'feedback_submitted', 'feedback_text_input', 'question_input')
+
+# Section headers the prompt asks Claude to use, each at the start of a line
+_SECTION_RE = re.compile(r'^(ANSWER|DETAILS|CODE REFERENCE|SOURCES):', re.MULTILINE)
+
+# Answers to repeat questions are reused across sessions for up to an hour
+ANSWER_CACHE_TTL = 3600
+ANSWER_CACHE_SIZE = 256
+
+# Reworded questions reuse an answer from earlier in the same session when
+# their embeddings are at least this similar (cosine); shares the answer
+# cache's TTL. Kept per session so one user's wording never answers another's.
+SEMANTIC_CACHE_SIZE = 32
+SEMANTIC_CACHE_THRESHOLD = 0.95
+
+
+@st.cache_resource
+def get_rag_engine():
+    """Shared RAG engine (vector store + Claude client) for all sessions"""
+    from utils.rag_engine import RAGEngine
+    engine = RAGEngine()
+    if engine.is_ready():
+        # Load the embedding model while the user is still typing
+        threading.Thread(target=engine.warm_up, name="rag-warmup", daemon=True).start()
+    return engine
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _engine_ready():
+    """Engine readiness, rechecked at most every 30 seconds"""
+    if get_rag_engine().is_ready():
+        return True
+    # Don't keep a broken engine cached - rebuild it on the next check
+    get_rag_engine.clear()
+    _cached_embed.clear()
+    return False
+
+
+@st.cache_resource
+def get_audit_logger():
+    """Shared audit logger for all sessions"""
+    from utils.database import AuditLogger
+    return AuditLogger()
+
+
+@st.cache_data(ttl=10, show_spinner=False)
+def _recent_queries(limit=5):
+    """Recent audit-log queries; cleared whenever a new query is logged"""
+    return get_audit_logger().get_recent_queries(limit=limit)
+
+
+def _normalize_question(question):
+    """Answer-cache key: case, whitespace, Unicode forms and trailing punctuation don't change the question"""
+    question = unicodedata.normalize('NFKC', question)
+    return " ".join(question.lower().split()).rstrip('.?! ')
+
+
+@st.cache_data(max_entries=1024, show_spinner=False)
+def _cached_embed(normalized_question):
+    """Question embedding, reused by every session when a question is asked again"""
+    return tuple(get_rag_engine().embed(normalized_question))
+
+
+@st.cache_resource
+def get_answer_cache():
+    """Shared answer cache: normalized question -> (time stored, result), oldest first"""
+    return OrderedDict(), threading.Lock()
+
+
+def _lookup_answer(key):
+    """Cached result for a normalized question, or None if missing/expired"""
+    cache, lock = get_answer_cache()
+    with lock:
+        entry = cache.get(key)
+        if entry is None:
+            return None
+        stored_at, result = entry
+        if time.time() - stored_at > ANSWER_CACHE_TTL:
+            del cache[key]
+            return None
+        cache.move_to_end(key)
+        return result
+
+
+def _store_answer(key, result):
+    """Cache a result, evicting the least recently used entries past the size limit"""
+    cache, lock = get_answer_cache()
+    with lock:
+        cache[key] = (time.time(), result)
+        cache.move_to_end(key)
+        while len(cache) > ANSWER_CACHE_SIZE:
+            cache.popitem(last=False)
+
+
+def _semantic_cache():
+    """This session's semantic cache: a ring of unit question embeddings and their (time stored, question, result)"""
+    return st.session_state.setdefault('semantic_cache', {'vectors': None, 'entries': [], 'next': 0})
+
+
+def _semantic_lookup(query_embedding):
+    """(question, result) for a recent, unexpired question with a near-identical embedding, or None"""
+    cache = _semantic_cache()
+    if not cache['entries']:
+        return None
+    query = np.asarray(query_embedding, dtype=np.float32)
+    query /= np.linalg.norm(query)
+
+    # Only unexpired entries compete for the best match
+    cutoff = time.time() - ANSWER_CACHE_TTL
+    live = [i for i, (stored_at, _, _) in enumerate(cache['entries']) if stored_at >= cutoff]
+    if not live:
+        return None
+    similarities = cache['vectors'][live] @ query
+    best = int(similarities.argmax())
+    if similarities[best] < SEMANTIC_CACHE_THRESHOLD:
+        return None
+    _, matched_question, result = cache['entries'][live[best]]
+    return matched_question, result
+
+
+def _semantic_store(query_embedding, question, result):
+    """Remember a result under its question embedding, overwriting the oldest slot when full"""
+    cache = _semantic_cache()
+    vector = np.asarray(query_embedding, dtype=np.float32)
+
+    if cache['vectors'] is None:
+        cache['vectors'] = np.zeros((SEMANTIC_CACHE_SIZE, vector.size), dtype=np.float32)
+    slot = cache['next']
+    cache['vectors'][slot] = vector / np.linalg.norm(vector)
+    entry = (time.time(), question, result)
+    if slot < len(cache['entries']):
+        cache['entries'][slot] = entry
+    else:
+        cache['entries'].append(entry)
+    cache['next'] = (slot + 1) % SEMANTIC_CACHE_SIZE
+
+
+def _compact_result(result):
+    """Keep only what the page displays, so each session holds a small result"""
+    compact = {
+        'answer': result.get('answer', ''),
+        'sources': [
+            {
+                'source_file': source.get('source_file', 'Unknown'),
+                'chunk_id': source.get('chunk_id', 'N/A'),
+                'similarity': source.get('similarity', 0)
+            }
+            for source in result.get('sources', [])
+        ],
+        'chunks_used': result.get('chunks_used', 0)
+    }
+    if 'token_usage' in result:
+        compact['token_usage'] = result['token_usage']
+    return compact
+
+
+def parse_response(text):
+    """Split a Claude response into its ANSWER/DETAILS/CODE REFERENCE/SOURCES sections"""
+    matches = list(_SECTION_RE.finditer(text))
+
+    # Canned messages (no relevant info, errors) have no headers
+    if not matches:
+        return {'answer': text.strip(), 'details': '', 'code_reference': '', 'sources': ''}
+
+    # Each section runs until the next header (or the end of the text)
+    ends = [m.start() for m in matches[1:]] + [len(text)]
+    found = {match.group(1): text[match.end():end].strip() for match, end in zip(matches, ends)}
+
+    return {
+        'answer': found.get('ANSWER', ''),
+        'details': found.get('DETAILS', ''),
+        'code_reference': found.get('CODE REFERENCE', ''),
+        'sources': found.get('SOURCES', '')
+    }
+
+
+def _escape_markdown(text):
+    """Show model text literally inside st.markdown"""
+    return _MARKDOWN_SPECIAL_RE.sub(r'\\\1', text)
+
+
+def display_formatted_answer(answer_text):
+    """Render the parsed answer: the direct answer, detail bullets and code reference"""
+    sections = parse_response(answer_text)
+
+    details_formatted = "".join(
+        _DETAIL_ITEM_TEMPLATE.format(text=_escape_markdown(line[2:] if line.startswith(('- ', '* ')) else line))
+        for line in map(str.strip, sections['details'].splitlines())
+        if line
+    )
+
+    code_reference = sections['code_reference']
+    if code_reference.lower() in _NO_CODE_REFERENCE:
+        code_reference = ""
+    else:
+        code_reference = _CODE_REFERENCE_TEMPLATE.format(code_reference=_escape_markdown(code_reference))
+
+    with st.container(border=True):
+        st.markdown(_ANSWER_TEMPLATE.format(
+            answer=_escape_markdown(sections['answer'] or 'No answer generated'),
+            details=_DETAILS_TEMPLATE.format(items=details_formatted) if details_formatted else "",
+            code_reference=code_reference
+        ))
+
+
+def _clear_question():
+    """Drop the question, result and feedback state; runs before the page redraws"""
+    for key in CLEARED_KEYS:
+        st.session_state.pop(key, None)
+
 
-# Custom Sidebar Navigation (matches app.py)
-st.sidebar.title("🧭 Navigation")
-st.sidebar.markdown("---")
-st.sidebar.page_link("app.py", label="🏡 Dashboard", icon=None)
-st.sidebar.page_link("pages/1_QA_Mode.py", label="💬 Q&A Mode", icon=None)
-st.sidebar.page_link("pages/2_Wizard_Mode.py", label="🧙‍♂️ Wizard Mode", icon=None)
-st.sidebar.markdown("---")
-st.sidebar.markdown("**Engineering AI Assistant**")
-st.sidebar.markdown("v1.0 | Brentwood, TN")
+def _open_feedback_form():
+    st.session_state.show_feedback_form = True
+
+
+def _close_feedback_form():
+    st.session_state.show_feedback_form = False
+
+
+def _mark_helpful():
+    st.session_state.feedback_submitted = True
+
+
+def _submit_feedback(answer):
+    """Queue the report for Google Sheets - the write happens in the background"""
+    from utils.google_sheets import queue_flagged_response
+    queue_flagged_response(
+        question=st.session_state.current_question,
+        ai_response=answer,
+        user_feedback=st.session_state.get('feedback_text_input', '')
+    )
+    st.session_state.feedback_submitted = True
+    st.session_state.show_feedback_form = False
+    st.session_state.pop('feedback_text_input', None)
+
+
+@st.fragment
+def feedback_section(result):
+    """Feedback buttons and report form - reruns on its own, not the whole page"""
+    # Only show buttons if feedback not yet submitted
+    if not st.session_state.feedback_submitted:
+        col_fb1, col_fb2 = st.columns(2)
+
+        with col_fb1:
+            st.button("👍 Yes, this helped!", use_container_width=True, on_click=_mark_helpful)
+
+        with col_fb2:
+            st.button("👎 Needs Improvement", use_container_width=True, type="secondary",
+                      on_click=_open_feedback_form)
+    
+    # =========================================================
+    # FEEDBACK FORM (shown when user clicks Needs Improvement)
+    # =========================================================
+    if st.session_state.show_feedback_form and not st.session_state.feedback_submitted:
+        st.markdown("""
+        <div class="feedback-popup">
+            <h4>🚩 Report an Issue</h4>
+            <p>Help us improve! Tell us what was wrong with this response.</p>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        # Feedback text input
+        st.text_area(
+            "What was wrong with the response? (optional but helpful)",
+            placeholder="Examples:\n- The answer was incorrect because...\n- It was missing information about...\n- The cited section doesn't actually say that...",
+            height=120,
+            key="feedback_text_input"
+        )
+        
+        col_submit1, col_submit2 = st.columns(2)
+        
+        with col_submit1:
+            # Send to Google Sheets
+            st.button("📤 Submit Feedback", type="primary", use_container_width=True,
+                      on_click=_submit_feedback, args=(result.get('answer', ''),))
+        
+        with col_submit2:
+            st.button("❌ Cancel", use_container_width=True, on_click=_close_feedback_form)
+    
+    # Show success message after feedback submitted
+    if st.session_state.feedback_submitted:
+        st.markdown("""
+        <div class="success-message">
+            ✅ <strong>Thank you for your feedback!</strong><br>
+            Your report has been submitted for review.
+        </div>
+        """, unsafe_allow_html=True)
 
 
 def main():
@@ -93,34 +424,22 @@ def main():
     st.title("💬 Engineering Q&A Mode")
     st.markdown("Ask questions about engineering policies and get accurate, cited answers.")
 
-    # Initialize components
-    if 'rag_engine' not in st.session_state:
-        st.session_state.rag_engine = RAGEngine()
-
-    if 'audit_logger' not in st.session_state:
-        st.session_state.audit_logger = AuditLogger()
-    
     # Initialize session state for preserving results
-    if 'current_result' not in st.session_state:
-        st.session_state.current_result = None
-    if 'current_question' not in st.session_state:
-        st.session_state.current_question = ""
-    if 'show_feedback_form' not in st.session_state:
-        st.session_state.show_feedback_form = False
-    if 'feedback_submitted' not in st.session_state:
-        st.session_state.feedback_submitted = False
+    for key, default in SESSION_DEFAULTS.items():
+        st.session_state.setdefault(key, default)
 
     # Check system readiness
-    if not st.session_state.rag_engine.is_ready():
+    if not _engine_ready():
         st.error("❌ System not ready. Please check:")
-        st.markdown("""
-        - Vector database exists in `vectorstore/` folder
-        - Claude API key is configured in secrets
-        """)
+        st.markdown(_NOT_READY_MD)
         if st.button("🏠 Return to Home"):
             st.switch_page("app.py")
         return
 
+    # Shared components (loaded once per process, not per session)
+    rag_engine = get_rag_engine()
+    audit_logger = get_audit_logger()
+
     st.success("✅ Q&A system is ready!")
 
     # Main interface
@@ -129,23 +448,20 @@ def main():
     with col1:
         # Question input
         st.subheader("❓ Ask Your Question")
-        question = st.text_area(
-            "Enter your engineering policy question:",
-            height=100,
-            placeholder="e.g., What are the minimum pipe sizes for drainage systems?",
-            key="question_input"
-        )
-
-        col1a, col1b = st.columns([1, 1])
-        with col1a:
-            ask_button = st.button("🔍 Get Answer", type="primary")
-        with col1b:
-            if st.button("🗑️ Clear"):
-                st.session_state.current_result = None
-                st.session_state.current_question = ""
-                st.session_state.show_feedback_form = False
-                st.session_state.feedback_submitted = False
-                st.rerun()
+        # In a form, editing the question doesn't rerun the page - only the buttons do
+        with st.form("question_form", border=False):
+            question = st.text_area(
+                "Enter your engineering policy question:",
+                height=100,
+                placeholder="e.g., What are the minimum pipe sizes for drainage systems?",
+                key="question_input"
+            )
+
+            col1a, col1b = st.columns([1, 1])
+            with col1a:
+                ask_button = st.form_submit_button("🔍 Get Answer", type="primary")
+            with col1b:
+                st.form_submit_button("🗑️ Clear", on_click=_clear_question)
 
         # Process NEW question
         if ask_button and question.strip():
@@ -153,26 +469,52 @@ def main():
             st.session_state.show_feedback_form = False
             st.session_state.feedback_submitted = False
             
-            with st.spinner("Searching through engineering manual..."):
-                try:
-                    result = st.session_state.rag_engine.query(question)
-                    
-                    # Store in session state so it persists
-                    st.session_state.current_result = result
-                    st.session_state.current_question = question
-
-                    # Log the query
-                    st.session_state.audit_logger.log_query(
-                        question=question,
-                        answer=result.get('answer', ''),
-                        sources=result.get('sources', []),
-                        chunks_used=result.get('chunks_used', 0),
-                        model_used=result.get('model_used', 'unknown')
-                    )
+            try:
+                cache_key = _normalize_question(question)
+                result = _lookup_answer(cache_key)
+
+                if result is None:
+                    with st.spinner("Searching through engineering manual..."):
+                        query_embedding = _cached_embed(cache_key)
+                        match = _semantic_lookup(query_embedding)
+                    if match is not None:
+                        matched_question, result = match
+                        st.info(f"♻️ Cached answer for a very similar earlier question: \"{_escape_markdown(matched_question)}\"")
+
+                if result is None:
+                    with st.spinner("Searching through engineering manual..."):
+                        result, answer_stream = rag_engine.query_stream(question, query_embedding=list(query_embedding))
+
+                    # Show the answer as it is generated; the formatted display below replaces it
+                    answer_slot = st.empty()
+                    with answer_slot.container():
+                        st.markdown("### 📝 Answer")
+                        result['answer'] = st.write_stream(answer_stream)
+                    answer_slot.empty()
+
+                    # Only cache real answers (token usage is filled in when Claude finishes)
+                    if result.get('token_usage', {}).get('output_tokens'):
+                        _store_answer(cache_key, result)
+                        _semantic_store(query_embedding, question, result)
+
+                # Store in session state so it persists
+                st.session_state.current_result = _compact_result(result)
+                st.session_state.current_question = question
+
+                # Log the query (cache hits included)
+                audit_logger.log_query(
+                    question=question,
+                    answer=result.get('answer', ''),
+                    sources=result.get('sources', []),
+                    chunks_used=result.get('chunks_used', 0),
+                    model_used=result.get('model_used', 'unknown')
+                )
+                # Every session shares this cache, so drop it for all of them
+                _recent_queries.clear()
 
-                except Exception as e:
-                    st.error(f"❌ Error processing question: {str(e)}")
-                    st.session_state.current_result = None
+            except Exception as e:
+                st.error(f"❌ Error processing question: {str(e)}")
+                st.session_state.current_result = None
         
         # =========================================================
         # DISPLAY RESULTS (from session state - persists on rerun)
@@ -186,23 +528,21 @@ def main():
             
             # Display answer
             st.markdown("### 📝 Answer")
-            st.markdown(f"""
-            <div class="answer-box">
-                {result.get('answer', 'No answer generated')}
-            </div>
-            """, unsafe_allow_html=True)
+            display_formatted_answer(result.get('answer', ''))
 
             # Display sources
             if result.get('sources'):
                 st.markdown("### 📚 Sources")
-                for i, source in enumerate(result['sources'], 1):
-                    st.markdown(f"""
-                    <div class="source-box">
-                        <strong>Source {i}:</strong> {source.get('source_file', 'Unknown')}
-                        (Chunk {source.get('chunk_id', 'N/A')})
-                        <br><small>Similarity: {source.get('similarity', 0):.3f}</small>
-                    </div>
-                    """, unsafe_allow_html=True)
+                sources_html = "".join(
+                    _SOURCE_TEMPLATE.format(
+                        num=i,
+                        source_file=html.escape(str(source.get('source_file', 'Unknown'))),
+                        chunk_id=html.escape(str(source.get('chunk_id', 'N/A'))),
+                        similarity=source.get('similarity', 0)
+                    )
+                    for i, source in enumerate(result['sources'], 1)
+                )
+                st.markdown(sources_html, unsafe_allow_html=True)
 
             # Performance metrics
             st.markdown("### 📊 Query Statistics")
@@ -222,104 +562,27 @@ def main():
             st.markdown("---")
             st.markdown("### 📢 Was this answer helpful?")
             
-            # Only show buttons if feedback not yet submitted
-            if not st.session_state.feedback_submitted:
-                col_fb1, col_fb2 = st.columns(2)
-
-                with col_fb1:
-                    if st.button("👍 Yes, this helped!", use_container_width=True):
-                        st.session_state.feedback_submitted = True
-                        st.rerun()
-
-                with col_fb2:
-                    if st.button("👎 Needs Improvement", use_container_width=True, type="secondary"):
-                        st.session_state.show_feedback_form = True
-                        st.rerun()
-            
-            # =========================================================
-            # FEEDBACK FORM (shown when user clicks Needs Improvement)
-            # =========================================================
-            if st.session_state.show_feedback_form and not st.session_state.feedback_submitted:
-                st.markdown("""
-                <div class="feedback-popup">
-                    <h4>🚩 Report an Issue</h4>
-                    <p>Help us improve! Tell us what was wrong with this response.</p>
-                </div>
-                """, unsafe_allow_html=True)
-                
-                # Feedback text input
-                feedback_text = st.text_area(
-                    "What was wrong with the response? (optional but helpful)",
-                    placeholder="Examples:\n- The answer was incorrect because...\n- It was missing information about...\n- The cited section doesn't actually say that...",
-                    height=120,
-                    key="feedback_text_input"
-                )
-                
-                col_submit1, col_submit2 = st.columns(2)
-                
-                with col_submit1:
-                    if st.button("📤 Submit Feedback", type="primary", use_container_width=True):
-                        # Send to Google Sheets
-                        success = log_flagged_response(
-                            question=st.session_state.current_question,
-                            ai_response=result.get('answer', ''),
-                            user_feedback=feedback_text
-                        )
-                        
-                        if success:
-                            st.session_state.feedback_submitted = True
-                            st.session_state.show_feedback_form = False
-                            st.rerun()
-                        else:
-                            st.error("❌ Could not submit feedback. Please try again.")
-                
-                with col_submit2:
-                    if st.button("❌ Cancel", use_container_width=True):
-                        st.session_state.show_feedback_form = False
-                        st.rerun()
-            
-            # Show success message after feedback submitted
-            if st.session_state.feedback_submitted:
-                st.markdown("""
-                <div class="success-message">
-                    ✅ <strong>Thank you for your feedback!</strong><br>
-                    Your report has been submitted for review.
-                </div>
-                """, unsafe_allow_html=True)
+            feedback_section(result)
 
     with col2:
         # Usage tips
         st.subheader("💡 Usage Tips")
-        st.markdown("""
-        **Ask specific questions:**
-        - "What are the setback requirements?"
-        - "What is the max encroachment into PUDE?"
-        - "What permits are needed for pools?"
-
-        **The system will:**
-        - Search the engineering manual
-        - Provide cited answers
-        - Show source locations
-        - Abstain if no relevant info found
-
-        **Report issues that are:**
-        - Incorrect or misleading
-        - Missing important details
-        - Not relevant to your question
-        """)
+        st.markdown(_USAGE_TIPS_MD)
 
         # Recent queries (from session)
         st.subheader("🔍 Recent Queries")
         try:
-            recent_queries = st.session_state.audit_logger.get_recent_queries(limit=5)
+            recent_queries = _recent_queries()
 
             if recent_queries:
                 for query in recent_queries[:5]:
                     q_text = query.get('question', 'No question')
                     q_preview = q_text[:40] + "..." if len(q_text) > 40 else q_text
                     with st.expander(f"📝 {q_preview}"):
-                        st.write(f"**Asked:** {query.get('timestamp', 'Unknown')[:19]}")
-                        st.write(f"**Sources:** {query.get('sources_count', 0)}")
+                        st.markdown(
+                            f"**Asked:** {query.get('timestamp', 'Unknown')[:19]}  \n"
+                            f"**Sources:** {query.get('sources_count', 0)}"
+                        )
             else:
                 st.write("No recent queries yet.")
         except:
@@ -330,9 +593,11 @@ def main():
     col1, col2 = st.columns(2)
     with col1:
         if st.button("🏠 Home"):
+            st.session_state.pop('current_result', None)
             st.switch_page("app.py")
     with col2:
         if st.button("🧙‍♂️ Wizard Mode"):
+            st.session_state.pop('current_result', None)
             st.switch_page("pages/2_Wizard_Mode.py")
 
 
@@ -31,25 +31,24 @@ Update Log:
 """
 
 import streamlit as st
-import sys
 import csv
 import zlib
 import random
 import string
-from pathlib import Path
+from collections import Counter
+from copy import copy
 from datetime import datetime
 from io import BytesIO, StringIO
+from types import SimpleNamespace
 
-# Add utils to path
-sys.path.append(str(Path(__file__).parent.parent / "utils"))
-
-from checklist_data import (
+from utils.checklist_data import (
     REVIEW_TYPES, 
     REVIEWERS, 
     CHECKLIST_SECTIONS,
     get_checklist_for_review_type
 )
-from comments_database import COMMENTS, get_comment
+from utils.comments_database import COMMENTS, get_comment
+from utils.navigation import render_sidebar
 
 # Import python-docx for Word export
 try:
@@ -57,164 +56,275 @@ try:
     from docx.shared import Inches, Pt, RGBColor
     from docx.enum.text import WD_ALIGN_PARAGRAPH
     from docx.enum.style import WD_STYLE_TYPE
+    from docx.oxml import parse_xml
     DOCX_AVAILABLE = True
 except ImportError:
     DOCX_AVAILABLE = False
 
+# Session state keys and their initial values
+SESSION_DEFAULTS = {
+    'wizard_review_type': None,
+    'wizard_permit_number': "",
+    'wizard_address': "",
+    'wizard_reviewer': None,
+    'wizard_checklist_state': {},
+    'wizard_selected_comments': {},
+    'wizard_custom_notes': {},
+    'wizard_started': False,
+    'wizard_resubmittal': "—"
+}
+
+# Step 1 selectbox options ("" = nothing chosen) and their positions
+_REVIEW_TYPE_OPTIONS = ("", *REVIEW_TYPES)
+_REVIEW_TYPE_INDEX = {name: i for i, name in enumerate(_REVIEW_TYPE_OPTIONS)}
+_REVIEWER_OPTIONS = ("", *REVIEWERS)
+_REVIEWER_INDEX = {name: i for i, name in enumerate(_REVIEWER_OPTIONS)}
+
+# Radio options; "—" means not answered yet
+_STATUS_OPTIONS = ("—", "Yes", "No", "N/A")
+_RESUBMITTAL_OPTIONS = ("—", "Yes", "N/A")
+
 st.set_page_config(page_title="Wizard Mode", page_icon="📋", layout="wide")
 
 # =============================================================================
 # CUSTOM CSS - Dark Mode Safe
 # =============================================================================
-st.markdown("""
+_CSS = """
 <style>
     /* Hide default streamlit page navigation */
     [data-testid="stSidebarNav"] {
         display: none;
     }
-    .review-header {
-        background: linear-gradient(135deg, #1e3a5f 0%, #2d5a87 100%) !important;
-        color: white !important;
-        padding: 1.5rem;
-        border-radius: 10px;
-        margin-bottom: 1rem;
-    }
-    .section-header {
-        background: #f0f4f8 !important;
-        color: #1a1a2e !important;
-        padding: 0.75rem 1rem;
-        border-left: 4px solid #1e3a5f;
-        margin: 1rem 0 0.5rem 0;
-        font-weight: bold;
-    }
-    .checklist-item {
-        background: #ffffff !important;
-        color: #1a1a2e !important;
-        border: 1px solid #e0e0e0;
-        border-radius: 5px;
-        padding: 0.75rem;
-        margin: 0.5rem 0;
-    }
-    .comment-box {
-        background: #fff8e1 !important;
-        color: #1a1a2e !important;
-        border: 1px solid #ffd54f;
-        border-radius: 5px;
-        padding: 0.75rem;
-        margin: 0.5rem 0 0.5rem 1rem;
-        font-size: 0.9em;
-    }
-    .status-yes { color: #2e7d32 !important; font-weight: bold; }
-    .status-no { color: #c62828 !important; font-weight: bold; }
-    .status-na { color: #757575 !important; font-weight: bold; }
-    .export-section {
-        background: #e8f5e9 !important;
-        color: #1a1a2e !important;
-        border: 1px solid #a5d6a7;
-        border-radius: 8px;
-        padding: 1rem;
-        margin: 1rem 0;
-    }
-    .resubmittal-box {
-        background: #e3f2fd !important;
-        color: #1a1a2e !important;
-        border: 2px solid #1976d2;
-        border-radius: 8px;
-        padding: 1rem;
-        margin: 1rem 0;
-    }
     /* Compact radio buttons - reduce vertical padding */
     div[data-testid="stRadio"] > div {
         gap: 0.5rem;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+st.markdown(_CSS, unsafe_allow_html=True)
 
-# Custom Sidebar Navigation (matches app.py)
-st.sidebar.title("🧭 Navigation")
-st.sidebar.markdown("---")
-st.sidebar.page_link("app.py", label="🏡 Dashboard", icon=None)
-st.sidebar.page_link("pages/1_QA_Mode.py", label="💬 Q&A Mode", icon=None)
-st.sidebar.page_link("pages/2_Wizard_Mode.py", label="🧙‍♂️ Wizard Mode", icon=None)
-st.sidebar.markdown("---")
-st.sidebar.markdown("**Engineering AI Assistant**")
-st.sidebar.markdown("v1.0 | Brentwood, TN")
+# Custom Sidebar Navigation
+render_sidebar()
 
 
 def initialize_session_state():
     """Initialize session state variables"""
-    if 'wizard_review_type' not in st.session_state:
-        st.session_state.wizard_review_type = None
-    if 'wizard_permit_number' not in st.session_state:
-        st.session_state.wizard_permit_number = ""
-    if 'wizard_address' not in st.session_state:
-        st.session_state.wizard_address = ""
-    if 'wizard_reviewer' not in st.session_state:
-        st.session_state.wizard_reviewer = None
-    if 'wizard_checklist_state' not in st.session_state:
-        st.session_state.wizard_checklist_state = {}
-    if 'wizard_selected_comments' not in st.session_state:
-        st.session_state.wizard_selected_comments = {}
-    if 'wizard_custom_notes' not in st.session_state:
-        st.session_state.wizard_custom_notes = {}
-    if 'wizard_started' not in st.session_state:
-        st.session_state.wizard_started = False
-    if 'wizard_resubmittal' not in st.session_state:
-        st.session_state.wizard_resubmittal = "—"
+    for key, default in SESSION_DEFAULTS.items():
+        # Copy so sessions never share the default dicts
+        st.session_state.setdefault(key, copy(default))
 
 
 def reset_checklist():
     """Reset checklist state when review type changes"""
-    st.session_state.wizard_checklist_state = {}
+    # Every item starts unanswered ("—"), so the render loop only ever assigns
+    review_type = st.session_state.wizard_review_type
+    st.session_state.wizard_checklist_state = (
+        {item["id"]: "—" for _, _, item in _checklist_index(review_type).flat}
+        if review_type else {}
+    )
     st.session_state.wizard_selected_comments = {}
     st.session_state.wizard_custom_notes = {}
     st.session_state.wizard_resubmittal = "—"
 
 
-def collect_all_comments():
-    """
-    Collect all comments from checklist items marked 'No', then append
-    the resubmittal comment (BB-0045) at the very end if the standalone
-    resubmittal question was answered 'Yes'.
+@st.cache_resource(show_spinner=False)
+def _checklist_index(review_type):
+    """Checklist for a review type plus a flattened view, built once per process"""
+    checklist = get_checklist_for_review_type(review_type)
+    flat = [
+        (section_id, section_data["name"], item)
+        for section_id, section_data in checklist.items()
+        for item in section_data["items"]
+    ]
+    return SimpleNamespace(
+        raw=checklist,
+        flat=flat,
+        total=len(flat),
+        # item id -> ((comment_id, text), ...) for the comments that exist
+        comments_by_item={
+            item["id"]: tuple(
+                (comment_id, COMMENTS[comment_id])
+                for comment_id in item.get("comment_ids", [])
+                if COMMENTS.get(comment_id)
+            )
+            for _, _, item in flat
+        },
+        # Render strings for the checklist UI, built here instead of on every rerun
+        item_labels={item["id"]: f"**{item['id']}** - {item['description']}" for _, _, item in flat},
+        comment_choices={
+            item["id"]: tuple(_comment_choice(comment_id) for comment_id in item.get("comment_ids", []))
+            for _, _, item in flat
+        }
+    )
 
-    Returns a list of raw comment strings (no prefix codes).
-    Used by all export functions to ensure consistent output.
-    """
-    checklist = get_checklist_for_review_type(st.session_state.wizard_review_type)
-    all_comments = []
 
-    # Gather comments from all checklist items marked "No"
-    for section_id, section_data in checklist.items():
-        for item in section_data["items"]:
-            item_key = item["id"]
-            if st.session_state.wizard_checklist_state.get(item_key) == "No":
-                selected = st.session_state.wizard_selected_comments.get(item_key, [])
-                custom_note = st.session_state.wizard_custom_notes.get(item_key, "")
+def _comment_choice(comment_id):
+    """(comment_id, checkbox label, tooltip) for one standard comment"""
+    comment_text = COMMENTS.get(comment_id, "Comment not found")
+    if len(comment_text) > 150:
+        # Truncated comments show their full text in the tooltip
+        return comment_id, f"**{comment_id}**: {comment_text[:150]}...", comment_text
+    return comment_id, f"**{comment_id}**: {comment_text}", None
 
-                for comment_id in selected:
-                    comment_text = COMMENTS.get(comment_id, "")
-                    if comment_text:
-                        all_comments.append(comment_text)
 
-                if custom_note.strip():
-                    all_comments.append(custom_note.strip())
+def _status_counts(checklist_state):
+    """(yes, no, n/a) counts for a checklist state dict, in one pass"""
+    counts = Counter(checklist_state.values())
+    return counts["Yes"], counts["No"], counts["N/A"]
+
+
+def _checklist_snapshot():
+    """Hashable copy of the answered checklist statuses"""
+    return tuple(sorted(
+        (item_key, status)
+        for item_key, status in st.session_state.wizard_checklist_state.items()
+        if status != "—"
+    ))
+
+
+def collect_comment_rows():
+    """
+    Walk the checklist once and return every comment in the review as
+    (item_id, code, text) rows: the selected comments and custom note
+    (code "CUSTOM") of each item marked 'No', in checklist order, then
+    the resubmittal comment (BB-0045, item_id None) if answered 'Yes'.
+    Selected comments follow the item's own comment order.
+
+    Called once per run of review_steps; every export takes its rows.
+    """
+    checklist_state = st.session_state.wizard_checklist_state
+    selected_comments = st.session_state.wizard_selected_comments
+    custom_notes = st.session_state.wizard_custom_notes
+    rows = []
+
+    idx = _checklist_index(st.session_state.wizard_review_type)
+    for _, _, item in idx.flat:
+        item_key = item["id"]
+        if checklist_state.get(item_key) == "No":
+            selected = selected_comments.get(item_key, ())
+            for comment_id, comment_text in idx.comments_by_item[item_key]:
+                if comment_id in selected:
+                    rows.append((item_key, comment_id, comment_text))
+
+            custom_note = custom_notes.get(item_key, "").strip()
+            if custom_note:
+                rows.append((item_key, "CUSTOM", custom_note))
 
-    # Append resubmittal comment at the very end if "Yes" was selected
     if st.session_state.wizard_resubmittal == "Yes":
         resubmittal_text = COMMENTS.get("BB-0045", "")
         if resubmittal_text:
-            all_comments.append(resubmittal_text)
+            rows.append((None, "BB-0045", resubmittal_text))
+
+    return tuple(rows)
 
-    return all_comments
+
+def _build_quickcopy_text(comment_rows):
+    """Numbered "[code] text" list for the Quick Copy panel"""
+    buffer = StringIO()
+    for i, (_, code, text) in enumerate(comment_rows, 1):
+        if i > 1:
+            buffer.write("\n\n")
+        buffer.write(f"{i}. [{code}] ")
+        buffer.write(text)
+    return buffer.getvalue()
 
 
-def generate_word_document():
-    """Generate a Word document with review comments"""
+def generate_word_document(comment_rows):
+    """Generate a Word document with review comments (bytes, or None without python-docx)"""
     if not DOCX_AVAILABLE:
         return None
     
+    # Snapshot the review as hashable values so an unchanged review reuses the cached file
+    return _build_docx_bytes(
+        review_type=st.session_state.wizard_review_type,
+        permit_number=st.session_state.wizard_permit_number,
+        address=st.session_state.wizard_address,
+        reviewer=st.session_state.wizard_reviewer,
+        review_date=datetime.now().strftime('%Y-%m-%d %H:%M'),
+        checklist_state=_checklist_snapshot(),
+        resubmittal=st.session_state.wizard_resubmittal,
+        comment_rows=comment_rows
+    )
+
+
+# Two-column "Table Grid" label/value table, as doc.add_table() would build it
+_TABLE_XML = (
+    '<w:tbl xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+    '<w:tblPr><w:tblStyle w:val="TableGrid"/><w:tblW w:type="auto" w:w="0"/>'
+    '<w:tblLook w:firstColumn="1" w:firstRow="1" w:lastColumn="0" w:lastRow="0"'
+    ' w:noHBand="0" w:noVBand="1" w:val="04A0"/></w:tblPr>'
+    '<w:tblGrid><w:gridCol w:w="4320"/><w:gridCol w:w="4320"/></w:tblGrid>'
+    '{rows}</w:tbl>'
+)
+_TABLE_ROW_XML = (
+    '<w:tr>'
+    '<w:tc><w:tcPr><w:tcW w:type="dxa" w:w="4320"/></w:tcPr>'
+    '<w:p><w:r>{label_props}<w:t xml:space="preserve">{label}</w:t></w:r></w:p></w:tc>'
+    '<w:tc><w:tcPr><w:tcW w:type="dxa" w:w="4320"/></w:tcPr>'
+    '<w:p><w:r><w:t xml:space="preserve">{value}</w:t></w:r></w:p></w:tc>'
+    '</w:tr>'
+)
+
+
+def _add_label_table(doc, rows, bold_labels=False):
+    """Append a (label, value) table to the document with a single XML parse"""
+    label_props = '<w:rPr><w:b/></w:rPr>' if bold_labels else ''
+    table = parse_xml(_TABLE_XML.format(rows=''.join(
+        _TABLE_ROW_XML.format(label_props=label_props, label=_xml_escape(label), value=_xml_escape(value))
+        for label, value in rows
+    )))
+    
+    # Body content must stay ahead of the trailing section properties
+    body = doc.element.body
+    if body.sectPr is not None:
+        body.sectPr.addprevious(table)
+    else:
+        body.append(table)
+    return table
+
+
+@st.cache_resource(show_spinner=False)
+def _template_doc_bytes():
+    """Blank export template with the review styles applied, saved once per process"""
     doc = Document()
     
+    # Copy/paste comments carry their own gap instead of an empty spacer paragraph;
+    # Normal keeps the template's spacing so the checklist tables are unchanged
+    comment_style = doc.styles.add_style('Copy Comment', WD_STYLE_TYPE.PARAGRAPH)
+    comment_style.base_style = doc.styles['Normal']
+    comment_style.paragraph_format.space_after = Pt(24)
+    
+    buffer = BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+def _fresh_doc():
+    """New Document loaded from the cached template bytes"""
+    return Document(BytesIO(_template_doc_bytes()))
+
+
+def _append_comment(doc, number, text, style):
+    """Add one numbered copy/paste comment paragraph"""
+    para = doc.add_paragraph(style=style)
+    para.add_run(f"{number}. ").bold = True
+    para.add_run(text)
+    return para
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def _build_docx_bytes(review_type, permit_number, address, reviewer, review_date,
+                      checklist_state, resubmittal, comment_rows):
+    """Build the review .docx from a snapshot of the wizard state"""
+    checklist_state = dict(checklist_state)
+    item_comments = {}
+    for item_key, code, text in comment_rows:
+        if item_key is not None:
+            item_comments.setdefault(item_key, []).append((code, text))
+    
+    doc = _fresh_doc()
+    
     # =========================================================================
     # TITLE
     # =========================================================================
@@ -225,62 +335,47 @@ def generate_word_document():
     # PROJECT INFORMATION
     # =========================================================================
     doc.add_heading('Project Information', level=1)
-    info_table = doc.add_table(rows=5, cols=2)
-    info_table.style = 'Table Grid'
     
     info_data = [
-        ('Review Type:', st.session_state.wizard_review_type or 'Not specified'),
-        ('Permit Number:', st.session_state.wizard_permit_number or 'Not specified'),
-        ('Address:', st.session_state.wizard_address or 'Not specified'),
-        ('Reviewer:', st.session_state.wizard_reviewer or 'Not specified'),
-        ('Review Date:', datetime.now().strftime('%Y-%m-%d %H:%M')),
+        ('Review Type:', review_type or 'Not specified'),
+        ('Permit Number:', permit_number or 'Not specified'),
+        ('Address:', address or 'Not specified'),
+        ('Reviewer:', reviewer or 'Not specified'),
+        ('Review Date:', review_date),
     ]
     
-    for i, (label, value) in enumerate(info_data):
-        info_table.rows[i].cells[0].text = label
-        info_table.rows[i].cells[1].text = value
-        info_table.rows[i].cells[0].paragraphs[0].runs[0].bold = True
-    
-    doc.add_paragraph()
+    _add_label_table(doc, info_data, bold_labels=True)
     
     # =========================================================================
     # SUMMARY STATISTICS
     # =========================================================================
     doc.add_heading('Review Summary', level=1)
     
-    yes_count = sum(1 for v in st.session_state.wizard_checklist_state.values() if v == "Yes")
-    no_count = sum(1 for v in st.session_state.wizard_checklist_state.values() if v == "No")
-    na_count = sum(1 for v in st.session_state.wizard_checklist_state.values() if v == "N/A")
+    yes_count, no_count, na_count = _status_counts(checklist_state)
     total = yes_count + no_count + na_count
     
-    summary_table = doc.add_table(rows=5, cols=2)
-    summary_table.style = 'Table Grid'
     summary_data = [
         ('Total Items Reviewed:', str(total)),
         ('Compliant (Yes):', str(yes_count)),
         ('Issues Found (No):', str(no_count)),
         ('Not Applicable:', str(na_count)),
-        ('Resubmittal Comment:', st.session_state.wizard_resubmittal),
+        ('Resubmittal Comment:', resubmittal),
     ]
-    for i, (label, value) in enumerate(summary_data):
-        summary_table.rows[i].cells[0].text = label
-        summary_table.rows[i].cells[1].text = value
-    
-    doc.add_paragraph()
+    _add_label_table(doc, summary_data)
     
     # =========================================================================
     # FULL CHECKLIST WITH STATUS AND COMMENTS
     # =========================================================================
     doc.add_heading('Plan Review Checklist', level=1)
     
-    checklist = get_checklist_for_review_type(st.session_state.wizard_review_type)
+    checklist = _checklist_index(review_type).raw
     
     for section_id, section_data in checklist.items():
         section_heading = doc.add_heading(section_data["name"], level=2)
         
         for item in section_data["items"]:
             item_key = item["id"]
-            status = st.session_state.wizard_checklist_state.get(item_key, "Not Reviewed")
+            status = checklist_state.get(item_key, "Not Reviewed")
             
             para = doc.add_paragraph()
             item_run = para.add_run(f"{item['id']} - {item['description']}")
@@ -299,37 +394,24 @@ def generate_word_document():
             else:
                 status_run.font.color.rgb = RGBColor(255, 165, 0)
             
-            if status == "No":
-                selected = st.session_state.wizard_selected_comments.get(item_key, [])
-                custom_note = st.session_state.wizard_custom_notes.get(item_key, "")
+            if item_key in item_comments:
+                para.add_run("\n")
+                comments_label = para.add_run("Comments:")
+                comments_label.bold = True
+                comments_label.font.color.rgb = RGBColor(0, 0, 128)
                 
-                if selected or custom_note.strip():
-                    para.add_run("\n")
-                    comments_label = para.add_run("Comments:")
-                    comments_label.bold = True
-                    comments_label.font.color.rgb = RGBColor(0, 0, 128)
-                    
-                    for comment_id in selected:
-                        comment_text = COMMENTS.get(comment_id, "")
-                        if comment_text:
-                            comment_para = doc.add_paragraph()
-                            comment_para.paragraph_format.left_indent = Inches(0.5)
-                            comment_run = comment_para.add_run(f"• [{comment_id}] {comment_text}")
-                            comment_run.font.size = Pt(10)
-                    
-                    if custom_note.strip():
-                        custom_para = doc.add_paragraph()
-                        custom_para.paragraph_format.left_indent = Inches(0.5)
-                        custom_run = custom_para.add_run(f"• [CUSTOM] {custom_note}")
-                        custom_run.font.size = Pt(10)
-                        custom_run.italic = True
-        
-        doc.add_paragraph()
+                for code, comment_text in item_comments[item_key]:
+                    comment_para = doc.add_paragraph()
+                    comment_para.paragraph_format.left_indent = Inches(0.5)
+                    comment_run = comment_para.add_run(f"• [{code}] {comment_text}")
+                    comment_run.font.size = Pt(10)
+                    if code == "CUSTOM":
+                        comment_run.italic = True
     
     # =========================================================================
     # RESUBMITTAL STATUS IN DOCUMENT
     # =========================================================================
-    if st.session_state.wizard_resubmittal == "Yes":
+    if resubmittal == "Yes":
         doc.add_heading('Resubmittal', level=2)
         resub_para = doc.add_paragraph()
         resub_run = resub_para.add_run("Standard resubmittal comment included (BB-0045)")
@@ -345,39 +427,32 @@ def generate_word_document():
     intro_para = doc.add_paragraph()
     intro_para.add_run("Use the comments below for Bluebeam or permit system. ").italic = True
     intro_para.add_run("Only items marked 'No' with selected comments are included.").italic = True
-    if st.session_state.wizard_resubmittal == "Yes":
+    if resubmittal == "Yes":
         intro_para.add_run(" Resubmittal comment appended at end.").italic = True
-    doc.add_paragraph()
     
-    all_comments = collect_all_comments()
-    
-    if all_comments:
-        for i, comment in enumerate(all_comments, 1):
-            para = doc.add_paragraph()
-            num_run = para.add_run(f"{i}. ")
-            num_run.bold = True
-            para.add_run(comment)
-            doc.add_paragraph()
+    if comment_rows:
+        comment_style = doc.styles['Copy Comment']
+        for i, (_, _, comment) in enumerate(comment_rows, 1):
+            _append_comment(doc, i, comment, comment_style)
     else:
         doc.add_paragraph("No comments to include - all items are compliant or N/A.")
     
     buffer = BytesIO()
     doc.save(buffer)
-    buffer.seek(0)
-    return buffer
+    return buffer.getvalue()
 
 
 # =============================================================================
 # LAMA CSV EXPORT
 # =============================================================================
 
-def generate_lama_csv():
+def generate_lama_csv(comment_rows):
     """
     Generate CSV for the LAMA Comment Uploader chrome extension.
     Format: Single column with header 'Comments', RFC 4180 quoting.
     Includes resubmittal comment at end if selected.
     """
-    comments = collect_all_comments()
+    comments = [text for _, _, text in comment_rows]
     if not comments:
         return None
 
@@ -467,12 +542,12 @@ def _build_annotation_raw(comment_text, reviewer, annot_id, rect, pdf_date):
     return compressed.hex()
 
 
-def generate_bluebeam_bax():
+def generate_bluebeam_bax(comment_rows):
     """
     Generate a Bluebeam BAX file with fully styled FreeText annotations.
     Includes resubmittal comment at end if selected.
     """
-    comments = collect_all_comments()
+    comments = [text for _, _, text in comment_rows]
     if not comments:
         return None
 
@@ -543,81 +618,32 @@ def generate_bluebeam_bax():
     return b'\xef\xbb\xbf' + bax_crlf.encode('utf-8')
 
 
-def main():
-    """Main function for Wizard Mode"""
-    initialize_session_state()
-    
-    st.title("📋 Engineering Review Wizard")
-    st.markdown("Interactive checklist for plan reviews with automatic comment generation.")
-    
-    # =========================================================================
-    # STEP 1: PROJECT SETUP
-    # =========================================================================
-    st.markdown("---")
-    st.subheader("📝 Step 1: Project Setup")
-    
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        review_type = st.selectbox(
-            "Review Type",
-            options=[""] + REVIEW_TYPES,
-            index=0 if not st.session_state.wizard_review_type else REVIEW_TYPES.index(st.session_state.wizard_review_type) + 1,
-            key="review_type_select"
-        )
-        
-        if review_type and review_type != st.session_state.wizard_review_type:
-            st.session_state.wizard_review_type = review_type
-            reset_checklist()
-            st.rerun()
-        elif review_type:
-            st.session_state.wizard_review_type = review_type
-    
-    with col2:
-        permit_number = st.text_input(
-            "Permit Number",
-            value=st.session_state.wizard_permit_number,
-            placeholder="e.g., SW2024-001"
-        )
-        st.session_state.wizard_permit_number = permit_number
-    
-    with col3:
-        address = st.text_input(
-            "Address",
-            value=st.session_state.wizard_address,
-            placeholder="e.g., 1808 Sonoma Trce"
-        )
-        st.session_state.wizard_address = address
-    
-    with col4:
-        reviewer = st.selectbox(
-            "Reviewer",
-            options=[""] + REVIEWERS,
-            index=0 if not st.session_state.wizard_reviewer else REVIEWERS.index(st.session_state.wizard_reviewer) + 1
-        )
-        st.session_state.wizard_reviewer = reviewer if reviewer else None
-    
-    if not st.session_state.wizard_review_type:
-        st.info("👆 Select a review type to begin.")
-        return
-    
+@st.fragment
+def review_steps(idx):
+    """
+    Checklist, resubmittal question, and summary/export (Steps 2-3).
+
+    One fragment so a status change reruns only these steps while the
+    summary still sees it; Step 1 stays outside so changing the review
+    type reruns the whole page.
+    """
     # =========================================================================
     # STEP 2: INTERACTIVE CHECKLIST
     # =========================================================================
     st.markdown("---")
     st.subheader(f"📋 Step 2: {st.session_state.wizard_review_type} Checklist")
     
-    checklist = get_checklist_for_review_type(st.session_state.wizard_review_type)
+    checklist = idx.raw
     
-    total_items = sum(len(section["items"]) for section in checklist.values())
-    completed_items = len(st.session_state.wizard_checklist_state)
+    total_items = idx.total
+    completed_items = sum(_status_counts(st.session_state.wizard_checklist_state))
     
     st.progress(completed_items / total_items if total_items > 0 else 0)
     st.caption(f"Progress: {completed_items} of {total_items} items reviewed")
     
     # Display checklist by section
     for section_id, section_data in checklist.items():
-        st.markdown(f'<div class="section-header">{section_data["name"]}</div>', unsafe_allow_html=True)
+        st.subheader(section_data["name"])
         
         for item in section_data["items"]:
             item_key = item["id"]
@@ -625,56 +651,42 @@ def main():
             col1, col2 = st.columns([3, 1])
             
             with col1:
-                st.markdown(f"**{item['id']}** - {item['description']}")
+                st.markdown(idx.item_labels[item_key])
             
             with col2:
                 current_status = st.session_state.wizard_checklist_state.get(item_key, "—")
                 
                 status = st.radio(
                     f"Status for {item_key}",
-                    options=["—", "Yes", "No", "N/A"],
-                    index=["—", "Yes", "No", "N/A"].index(current_status) if current_status in ["—", "Yes", "No", "N/A"] else 0,
+                    options=_STATUS_OPTIONS,
+                    index=_STATUS_OPTIONS.index(current_status) if current_status in _STATUS_OPTIONS else 0,
                     key=f"status_{item_key}",
                     horizontal=True,
                     label_visibility="collapsed"
                 )
                 
-                if status and status != "—":
-                    st.session_state.wizard_checklist_state[item_key] = status
-                elif item_key in st.session_state.wizard_checklist_state:
-                    del st.session_state.wizard_checklist_state[item_key]
+                st.session_state.wizard_checklist_state[item_key] = status
             
             # If "No" is selected, show comment options
             if st.session_state.wizard_checklist_state.get(item_key) == "No":
-                with st.container():
-                    st.markdown('<div class="comment-box">', unsafe_allow_html=True)
+                with st.expander(f"📝 Comments for {item_key}", expanded=True):
                     st.markdown("**📝 Select applicable comments:**")
                     
-                    comment_ids = item.get("comment_ids", [])
+                    comment_choices = idx.comment_choices[item_key]
                     
-                    if comment_ids:
-                        if item_key not in st.session_state.wizard_selected_comments:
-                            st.session_state.wizard_selected_comments[item_key] = []
+                    if comment_choices:
+                        selected = st.session_state.wizard_selected_comments.setdefault(item_key, set())
                         
-                        for comment_id in comment_ids:
-                            comment_text = COMMENTS.get(comment_id, "Comment not found")
-                            display_text = comment_text[:150] + "..." if len(comment_text) > 150 else comment_text
-                            is_selected = comment_id in st.session_state.wizard_selected_comments[item_key]
-                            
+                        for comment_id, label, help_text in comment_choices:
                             if st.checkbox(
-                                f"**{comment_id}**: {display_text}",
-                                value=is_selected,
-                                key=f"comment_{item_key}_{comment_id}"
+                                label,
+                                value=comment_id in selected,
+                                key=f"comment_{item_key}_{comment_id}",
+                                help=help_text
                             ):
-                                if comment_id not in st.session_state.wizard_selected_comments[item_key]:
-                                    st.session_state.wizard_selected_comments[item_key].append(comment_id)
+                                selected.add(comment_id)
                             else:
-                                if comment_id in st.session_state.wizard_selected_comments[item_key]:
-                                    st.session_state.wizard_selected_comments[item_key].remove(comment_id)
-                            
-                            if len(comment_text) > 150:
-                                with st.expander("View full comment"):
-                                    st.write(comment_text)
+                                selected.discard(comment_id)
                     
                     st.markdown("**✏️ Custom notes (optional):**")
                     custom_note = st.text_area(
@@ -686,8 +698,6 @@ def main():
                         placeholder="Add any additional comments specific to this review..."
                     )
                     st.session_state.wizard_custom_notes[item_key] = custom_note
-                    
-                    st.markdown('</div>', unsafe_allow_html=True)
             
             st.markdown("---")
     
@@ -695,29 +705,26 @@ def main():
     # STANDALONE RESUBMITTAL QUESTION
     # Positioned between the checklist and Step 3, inside its own styled box
     # =========================================================================
-    st.markdown('<div class="resubmittal-box">', unsafe_allow_html=True)
-    
-    resub_col1, resub_col2 = st.columns([3, 1])
-    
-    with resub_col1:
-        st.markdown("**📬 Add standard resubmittal comment?**")
-        # Show preview of what BB-0045 says
-        resub_text = COMMENTS.get("BB-0045", "")
-        if resub_text:
-            st.caption(f'BB-0045: "{resub_text}"')
-    
-    with resub_col2:
-        resubmittal = st.radio(
-            "Resubmittal",
-            options=["—", "Yes", "N/A"],
-            index=["—", "Yes", "N/A"].index(st.session_state.wizard_resubmittal) if st.session_state.wizard_resubmittal in ["—", "Yes", "N/A"] else 0,
-            key="resubmittal_radio",
-            horizontal=True,
-            label_visibility="collapsed"
-        )
-        st.session_state.wizard_resubmittal = resubmittal
-    
-    st.markdown('</div>', unsafe_allow_html=True)
+    with st.container(border=True):
+        resub_col1, resub_col2 = st.columns([3, 1])
+        
+        with resub_col1:
+            st.markdown("**📬 Add standard resubmittal comment?**")
+            # Show preview of what BB-0045 says
+            resub_text = COMMENTS.get("BB-0045", "")
+            if resub_text:
+                st.caption(f'BB-0045: "{resub_text}"')
+        
+        with resub_col2:
+            resubmittal = st.radio(
+                "Resubmittal",
+                options=_RESUBMITTAL_OPTIONS,
+                index=_RESUBMITTAL_OPTIONS.index(st.session_state.wizard_resubmittal) if st.session_state.wizard_resubmittal in _RESUBMITTAL_OPTIONS else 0,
+                key="resubmittal_radio",
+                horizontal=True,
+                label_visibility="collapsed"
+            )
+            st.session_state.wizard_resubmittal = resubmittal
     
     # =========================================================================
     # STEP 3: REVIEW SUMMARY & EXPORT
@@ -725,12 +732,11 @@ def main():
     st.markdown("---")
     st.subheader("📊 Step 3: Review Summary & Export")
     
-    yes_count = sum(1 for v in st.session_state.wizard_checklist_state.values() if v == "Yes")
-    no_count = sum(1 for v in st.session_state.wizard_checklist_state.values() if v == "No")
-    na_count = sum(1 for v in st.session_state.wizard_checklist_state.values() if v == "N/A")
+    yes_count, no_count, na_count = _status_counts(st.session_state.wizard_checklist_state)
     
     # Include resubmittal in the "has comments" logic
     has_comments = no_count > 0 or st.session_state.wizard_resubmittal == "Yes"
+    comment_rows = collect_comment_rows()
     
     col1, col2, col3, col4 = st.columns(4)
     with col1:
@@ -743,85 +749,83 @@ def main():
         st.metric("📝 Total Reviewed", yes_count + no_count + na_count)
     
     # Export section
-    st.markdown('<div class="export-section">', unsafe_allow_html=True)
-    st.markdown("### 📤 Export Review")
-    
-    if not has_comments and (yes_count + na_count) > 0:
-        st.success("✅ No issues found! All reviewed items are compliant.")
-    elif has_comments:
-        comment_parts = []
-        if no_count > 0:
-            comment_parts.append(f"{no_count} issue(s) found")
-        if st.session_state.wizard_resubmittal == "Yes":
-            comment_parts.append("resubmittal comment included")
-        st.warning(f"⚠️ {' + '.join(comment_parts)}.")
-    
-    # Row 1: Word Document + Clear Review
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        if DOCX_AVAILABLE:
-            if st.button("📄 Generate Word Document", type="primary", use_container_width=True):
-                if not st.session_state.wizard_permit_number:
-                    st.error("Please enter a permit number before exporting.")
-                elif completed_items == 0:
-                    st.error("Please review at least one item before exporting.")
-                else:
-                    doc_buffer = generate_word_document()
-                    if doc_buffer:
-                        filename = f"Review_{st.session_state.wizard_permit_number}_{datetime.now().strftime('%Y%m%d')}.docx"
-                        st.download_button(
-                            label="⬇️ Download Word Document",
-                            data=doc_buffer,
-                            file_name=filename,
-                            mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-                            use_container_width=True
-                        )
-        else:
-            st.warning("python-docx not available. Install it to enable Word export.")
-    
-    with col2:
-        if st.button("🗑️ Clear Review", use_container_width=True):
-            reset_checklist()
-            st.session_state.wizard_permit_number = ""
-            st.session_state.wizard_address = ""
-            st.session_state.wizard_reviewer = None
-            st.rerun()
-
-    # Row 2: LAMA CSV + Bluebeam BAX (shown when there are any comments)
-    if has_comments:
-        st.markdown("#### 📊 Extract Comments")
-
-        permit_num = st.session_state.wizard_permit_number or "review"
-        datestamp = datetime.now().strftime('%Y%m%d')
-
-        col_e1, col_e2 = st.columns(2)
-
-        with col_e1:
-            lama_data = generate_lama_csv()
-            if lama_data:
-                st.download_button(
-                    label="📥 Create CSV File of Comments",
-                    data=lama_data,
-                    file_name=f"LAMA_Comments_{permit_num}_{datestamp}.csv",
-                    mime="text/csv",
-                    use_container_width=True,
-                    help="Single-column CSV for the LAMA Comment Uploader extension"
-                )
+    with st.container(border=True):
+        st.markdown("### 📤 Export Review")
+        
+        if not has_comments and (yes_count + na_count) > 0:
+            st.success("✅ No issues found! All reviewed items are compliant.")
+        elif has_comments:
+            comment_parts = []
+            if no_count > 0:
+                comment_parts.append(f"{no_count} issue(s) found")
+            if st.session_state.wizard_resubmittal == "Yes":
+                comment_parts.append("resubmittal comment included")
+            st.warning(f"⚠️ {' + '.join(comment_parts)}.")
+        
+        # Row 1: Word Document + Clear Review
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            if DOCX_AVAILABLE:
+                if st.button("📄 Generate Word Document", type="primary", use_container_width=True):
+                    if not st.session_state.wizard_permit_number:
+                        st.error("Please enter a permit number before exporting.")
+                    elif completed_items == 0:
+                        st.error("Please review at least one item before exporting.")
+                    else:
+                        doc_bytes = generate_word_document(comment_rows)
+                        if doc_bytes:
+                            filename = f"Review_{st.session_state.wizard_permit_number}_{datetime.now().strftime('%Y%m%d')}.docx"
+                            st.download_button(
+                                label="⬇️ Download Word Document",
+                                data=doc_bytes,
+                                file_name=filename,
+                                mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+                                use_container_width=True
+                            )
+            else:
+                st.warning("python-docx not available. Install it to enable Word export.")
+        
+        with col2:
+            if st.button("🗑️ Clear Review", use_container_width=True):
+                reset_checklist()
+                st.session_state.wizard_permit_number = ""
+                st.session_state.wizard_address = ""
+                st.session_state.wizard_reviewer = None
+                st.rerun()
+
+        # Row 2: LAMA CSV + Bluebeam BAX (shown when there are any comments)
+        if has_comments:
+            st.markdown("#### 📊 Extract Comments")
+
+            permit_num = st.session_state.wizard_permit_number or "review"
+            datestamp = datetime.now().strftime('%Y%m%d')
+
+            col_e1, col_e2 = st.columns(2)
+
+            with col_e1:
+                lama_data = generate_lama_csv(comment_rows)
+                if lama_data:
+                    st.download_button(
+                        label="📥 Create CSV File of Comments",
+                        data=lama_data,
+                        file_name=f"LAMA_Comments_{permit_num}_{datestamp}.csv",
+                        mime="text/csv",
+                        use_container_width=True,
+                        help="Single-column CSV for the LAMA Comment Uploader extension"
+                    )
 
-        with col_e2:
-            bax_data = generate_bluebeam_bax()
-            if bax_data:
-                st.download_button(
-                    label="📐 Create Bluebeam Comments File",
-                    data=bax_data,
-                    file_name=f"Markups_{permit_num}_{datestamp}.bax",
-                    mime="application/octet-stream",
-                    use_container_width=True,
-                    help="Import into Bluebeam via Markup → Import (.bax format with full styling)"
-                )
-    
-    st.markdown('</div>', unsafe_allow_html=True)
+            with col_e2:
+                bax_data = generate_bluebeam_bax(comment_rows)
+                if bax_data:
+                    st.download_button(
+                        label="📐 Create Bluebeam Comments File",
+                        data=bax_data,
+                        file_name=f"Markups_{permit_num}_{datestamp}.bax",
+                        mime="application/octet-stream",
+                        use_container_width=True,
+                        help="Import into Bluebeam via Markup → Import (.bax format with full styling)"
+                    )
     
     # Quick copy section for comments
     if has_comments:
@@ -829,37 +833,76 @@ def main():
         st.subheader("📋 Quick Copy - All Comments")
         st.caption("Copy these comments directly into Bluebeam or your permit system:")
         
-        all_comments = []
-        checklist = get_checklist_for_review_type(st.session_state.wizard_review_type)
-        for section_id, section_data in checklist.items():
-            for item in section_data["items"]:
-                item_key = item["id"]
-                if st.session_state.wizard_checklist_state.get(item_key) == "No":
-                    selected = st.session_state.wizard_selected_comments.get(item_key, [])
-                    custom_note = st.session_state.wizard_custom_notes.get(item_key, "")
-                    
-                    for comment_id in selected:
-                        comment_text = COMMENTS.get(comment_id, "")
-                        if comment_text:
-                            all_comments.append(f"[{comment_id}] {comment_text}")
-                    
-                    if custom_note.strip():
-                        all_comments.append(f"[CUSTOM] {custom_note}")
+        comments_text = _build_quickcopy_text(comment_rows)
         
-        # Append resubmittal at the end
-        if st.session_state.wizard_resubmittal == "Yes":
-            resub_text = COMMENTS.get("BB-0045", "")
-            if resub_text:
-                all_comments.append(f"[BB-0045] {resub_text}")
-        
-        if all_comments:
-            comments_text = "\n\n".join(f"{i+1}. {c}" for i, c in enumerate(all_comments))
+        if comments_text:
             st.text_area(
                 "All Comments",
                 value=comments_text,
                 height=300,
                 label_visibility="collapsed"
             )
+
+
+def main():
+    """Main function for Wizard Mode"""
+    initialize_session_state()
+    
+    st.title("📋 Engineering Review Wizard")
+    st.markdown("Interactive checklist for plan reviews with automatic comment generation.")
+    
+    # =========================================================================
+    # STEP 1: PROJECT SETUP
+    # =========================================================================
+    st.markdown("---")
+    st.subheader("📝 Step 1: Project Setup")
+    
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        review_type = st.selectbox(
+            "Review Type",
+            options=_REVIEW_TYPE_OPTIONS,
+            index=_REVIEW_TYPE_INDEX.get(st.session_state.wizard_review_type, 0),
+            key="review_type_select"
+        )
+        
+        if review_type and review_type != st.session_state.wizard_review_type:
+            st.session_state.wizard_review_type = review_type
+            reset_checklist()
+            st.rerun()
+        elif review_type:
+            st.session_state.wizard_review_type = review_type
+    
+    with col2:
+        permit_number = st.text_input(
+            "Permit Number",
+            value=st.session_state.wizard_permit_number,
+            placeholder="e.g., SW2024-001"
+        )
+        st.session_state.wizard_permit_number = permit_number
+    
+    with col3:
+        address = st.text_input(
+            "Address",
+            value=st.session_state.wizard_address,
+            placeholder="e.g., 1808 Sonoma Trce"
+        )
+        st.session_state.wizard_address = address
+    
+    with col4:
+        reviewer = st.selectbox(
+            "Reviewer",
+            options=_REVIEWER_OPTIONS,
+            index=_REVIEWER_INDEX.get(st.session_state.wizard_reviewer, 0)
+        )
+        st.session_state.wizard_reviewer = reviewer if reviewer else None
+    
+    if not st.session_state.wizard_review_type:
+        st.info("👆 Select a review type to begin.")
+        return
+    
+    review_steps(_checklist_index(st.session_state.wizard_review_type))
     
     # Navigation
     st.markdown("---")
@@ -1,8 +1,29 @@
 import sqlite3
 import json
+import queue
+import atexit
+import threading
 from datetime import datetime
 from pathlib import Path
 
+# orjson is optional - it only speeds up serializing the log columns
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _to_json(value):
+    """JSON text for a log column"""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(value).decode()
+        except TypeError:
+            pass
+    return json.dumps(value)
+
+
 class AuditLogger:
     """Audit logging system for tracking all system activity"""
     
@@ -13,14 +34,23 @@ class AuditLogger:
         # Create logs directory
         self.db_path.parent.mkdir(exist_ok=True)
         
+        # One connection shared by every session; the lock serializes its use
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        
         # Initialize database
         self._initialize_database()
         
+        # Query logs are written in batches by a background thread
+        self._query_queue = queue.Queue()
+        threading.Thread(target=self._query_writer, name="audit-log-writer", daemon=True).start()
+        atexit.register(self.flush)
+        
         print(f"✅ Audit Logger initialized at {db_path}")
     
     def _initialize_database(self):
         """Create database tables"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._lock, self._conn as conn:
             cursor = conn.cursor()
             
             # Query logs table
@@ -68,29 +98,49 @@ class AuditLogger:
             conn.commit()
     
     def log_query(self, question, answer, sources=None, chunks_used=0, model_used="unknown", user_session="anonymous"):
-        """Log a question and answer"""
+        """Log a question and answer (queued; written by the background writer)"""
         timestamp = datetime.now().isoformat()
-        sources_json = json.dumps(sources) if sources else "[]"
+        sources_json = _to_json(sources) if sources else "[]"
         
-        try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    INSERT INTO query_logs 
-                    (timestamp, question, answer, sources, chunks_used, model_used, user_session)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                """, (timestamp, question, answer, sources_json, chunks_used, model_used, user_session))
-                conn.commit()
-                
-        except Exception as e:
-            print(f"Error logging query: {e}")
+        self._query_queue.put_nowait(
+            (timestamp, question, answer, sources_json, chunks_used, model_used, user_session)
+        )
+    
+    def flush(self):
+        """Wait until every queued query log has been written"""
+        self._query_queue.join()
+    
+    def _query_writer(self, batch_size=32):
+        """Background thread: insert queued query logs, one transaction per batch"""
+        while True:
+            rows = [self._query_queue.get()]
+            while len(rows) < batch_size:
+                try:
+                    rows.append(self._query_queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            try:
+                with self._lock, self._conn as conn:
+                    conn.executemany("""
+                        INSERT INTO query_logs 
+                        (timestamp, question, answer, sources, chunks_used, model_used, user_session)
+                        VALUES (?, ?, ?, ?, ?, ?, ?)
+                    """, rows)
+                    
+            except Exception as e:
+                print(f"Error logging query: {e}")
+            
+            finally:
+                for _ in rows:
+                    self._query_queue.task_done()
     
     def flag_response(self, question, flag_type="negative", reason="", answer="", user_session="anonymous"):
         """Record flagged response"""
         timestamp = datetime.now().isoformat()
         
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._lock, self._conn as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
                     INSERT INTO flagged_responses
@@ -105,11 +155,11 @@ class AuditLogger:
     def log_wizard_completion(self, wizard_type, data=None, checklist=None, user_session="anonymous"):
         """Log wizard completion"""
         timestamp = datetime.now().isoformat()
-        data_json = json.dumps(data) if data else "{}"
-        checklist_json = json.dumps(checklist) if checklist else "[]"
+        data_json = _to_json(data) if data else "{}"
+        checklist_json = _to_json(checklist) if checklist else "[]"
         
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._lock, self._conn as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
                     INSERT INTO wizard_logs
@@ -123,8 +173,9 @@ class AuditLogger:
     
     def get_recent_queries(self, limit=10):
         """Get recent queries"""
+        self.flush()
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._lock, self._conn as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
                     SELECT timestamp, question, answer, chunks_used, model_used
@@ -155,7 +206,7 @@ class AuditLogger:
     def get_flagged_responses(self, status="open"):
         """Get flagged responses"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._lock, self._conn as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
                     SELECT timestamp, question, answer, flag_type, reason
@@ -187,8 +238,9 @@ class AuditLogger:
         try:
             from datetime import timedelta
             cutoff_date = (datetime.now() - timedelta(days=days)).isoformat()
+            self.flush()
             
-            with sqlite3.connect(self.db_path) as conn:
+            with self._lock, self._conn as conn:
                 cursor = conn.cursor()
                 
                 # Count queries
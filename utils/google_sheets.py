@@ -6,11 +6,14 @@ File: utils/google_sheets.py
 Purpose: Send flagged Q&A responses to a Google Sheet for admin review
 
 This connects to your Google Sheet and appends new rows when users
-flag responses as needing improvement.
+flag responses as needing improvement. Rows are queued and written by a
+background thread so the page never waits on the Sheets API.
 ==============================================================================
 """
 
 import streamlit as st
+import queue
+import threading
 from datetime import datetime
 
 # Google Sheets libraries
@@ -56,9 +59,39 @@ def get_google_sheet():
         return None
 
 
+def _build_row(question, ai_response, user_feedback=""):
+    """
+    Build a sheet row for a flagged response.
+    
+    Columns: Timestamp | Question | AI Response | User Feedback | Status
+    """
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    
+    # Truncate long responses to avoid issues
+    # Google Sheets cells have a 50,000 character limit
+    max_length = 5000
+    ai_response_truncated = ai_response[:max_length] if ai_response else ""
+    if ai_response and len(ai_response) > max_length:
+        ai_response_truncated += "... [truncated]"
+    
+    return [
+        timestamp,
+        question,
+        ai_response_truncated,
+        user_feedback if user_feedback else "(No feedback provided)",
+        "Open"  # Default status
+    ]
+
+
+def _append_row(worksheet, row):
+    """Append one row; INSERT_ROWS appends atomically, so concurrent writers don't overwrite each other"""
+    worksheet.append_row(row, value_input_option="RAW", insert_data_option="INSERT_ROWS")
+    print(f"✅ Flagged response logged to Google Sheet at {row[0]}")
+
+
 def log_flagged_response(question, ai_response, user_feedback=""):
     """
-    Log a flagged response to the Google Sheet.
+    Log a flagged response to the Google Sheet (blocks until written).
     
     Args:
         question (str): The question the user asked
@@ -76,30 +109,7 @@ def log_flagged_response(question, ai_response, user_feedback=""):
             print("Could not connect to Google Sheet")
             return False
         
-        # Prepare the row data
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        
-        # Truncate long responses to avoid issues
-        # Google Sheets cells have a 50,000 character limit
-        max_length = 5000
-        ai_response_truncated = ai_response[:max_length] if ai_response else ""
-        if len(ai_response) > max_length:
-            ai_response_truncated += "... [truncated]"
-        
-        # Create the row
-        # Columns: Timestamp | Question | AI Response | User Feedback | Status
-        new_row = [
-            timestamp,
-            question,
-            ai_response_truncated,
-            user_feedback if user_feedback else "(No feedback provided)",
-            "Open"  # Default status
-        ]
-        
-        # Append the row to the sheet
-        worksheet.append_row(new_row, value_input_option="USER_ENTERED")
-        
-        print(f"✅ Flagged response logged to Google Sheet at {timestamp}")
+        _append_row(worksheet, _build_row(question, ai_response, user_feedback))
         return True
     
     except Exception as e:
@@ -107,6 +117,56 @@ def log_flagged_response(question, ai_response, user_feedback=""):
         return False
 
 
+def _feedback_worker(feedback_queue):
+    """Write queued rows to the sheet, reusing one connection between rows"""
+    worksheet = None
+    
+    while True:
+        row = feedback_queue.get()
+        try:
+            if worksheet is None:
+                worksheet = get_google_sheet()
+            
+            if worksheet is None:
+                print("Could not connect to Google Sheet - flagged response dropped")
+            else:
+                _append_row(worksheet, row)
+        
+        except Exception as e:
+            print(f"Error logging to Google Sheet: {e}")
+            # Reconnect on the next row in case the session expired
+            worksheet = None
+        
+        finally:
+            feedback_queue.task_done()
+
+
+@st.cache_resource
+def _get_feedback_queue():
+    """Process-wide queue drained by a single background writer thread"""
+    feedback_queue = queue.Queue()
+    threading.Thread(
+        target=_feedback_worker,
+        args=(feedback_queue,),
+        name="flagged-response-writer",
+        daemon=True
+    ).start()
+    return feedback_queue
+
+
+def queue_flagged_response(question, ai_response, user_feedback=""):
+    """
+    Queue a flagged response to be logged to the Google Sheet in the background.
+    
+    Args:
+        question (str): The question the user asked
+        ai_response (str): The AI's response that was flagged
+        user_feedback (str): Optional feedback explaining what was wrong
+    """
+    # Timestamp the row now, not whenever the writer gets to it
+    _get_feedback_queue().put(_build_row(question, ai_response, user_feedback))
+
+
 def test_connection():
     """
     Test the Google Sheets connection.
@@ -0,0 +1,20 @@
+"""Custom sidebar navigation shared by every page (replaces the default "app" label)"""
+import streamlit as st
+
+# Sidebar navigation links (page, label) - Admin Panel removed
+PAGES = (
+    ("app.py", "🏡 Dashboard"),
+    ("pages/1_QA_Mode.py", "💬 Q&A Mode"),
+    ("pages/2_Wizard_Mode.py", "🧙‍♂️ Wizard Mode"),
+)
+
+
+def render_sidebar():
+    """Draw the navigation links and app footer in the sidebar"""
+    with st.sidebar:
+        st.title("🧭 Navigation")
+        st.markdown("---")
+        for page, label in PAGES:
+            st.page_link(page, label=label, icon=None)
+        st.markdown("---")
+        st.markdown("**Engineering AI Assistant**\n\nv1.0 | Brentwood, TN")
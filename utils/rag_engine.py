@@ -1,8 +1,38 @@
 import os
 import chromadb
+from concurrent.futures import ThreadPoolExecutor
+from chromadb.utils import embedding_functions
 from pathlib import Path
 import streamlit as st
 
+MODEL_NAME = "claude-sonnet-4-5-20250929"
+
+# Instructions shared by every question, sent as the system prompt. Not
+# prompt-cached: it is shorter than the minimum cacheable prefix.
+SYSTEM_PROMPT = """You are an expert assistant for a municipal engineering department. Answer questions using ONLY the provided context.
+
+You MUST respond using EXACTLY this format with these EXACT headers:
+
+ANSWER: [State the direct answer in one sentence with specific numbers/requirements]
+
+DETAILS:
+- [First supporting detail or related requirement]
+- [Second supporting detail if applicable]
+- [Additional details as needed]
+
+CODE REFERENCE: [Section number if mentioned in sources, or N/A]
+
+SOURCES: [SOURCE X, SOURCE Y]
+
+RULES:
+- Start with ANSWER: immediately - no other text before it
+- Keep the ANSWER line to 1-2 sentences maximum
+- Use simple bullet points with - for DETAILS
+- Do not use markdown formatting like ** or ## or ###
+- Do not add any headers other than ANSWER:, DETAILS:, CODE REFERENCE:, and SOURCES:
+- If information is not in the context, say: ANSWER: The Engineering Manual does not contain this information."""
+
+
 class RAGEngine:
     """RAG Engine for question answering using the engineering manual"""
     
@@ -10,6 +40,7 @@ class RAGEngine:
         """Initialize the RAG engine"""
         self.client = None
         self.collections = {}
+        self.embedding_function = None
         self.claude_client = None
         self.is_initialized = False
         
@@ -27,6 +58,9 @@ class RAGEngine:
         
         self.client = chromadb.PersistentClient(path=str(vectorstore_path))
         
+        # Same model the collections were built with, so questions can be embedded once
+        self.embedding_function = embedding_functions.DefaultEmbeddingFunction()
+        
         # Load collections
         collection_names = {
             'fine': 'engineering_manual_fine',
@@ -68,28 +102,41 @@ class RAGEngine:
         """Check if the RAG engine is ready"""
         return self.is_initialized and self.client and self.claude_client
     
-    def query(self, question, max_chunks=5, similarity_threshold=0.6):
+    def warm_up(self):
+        """Load the embedding model and touch each collection so the first question is fast"""
+        try:
+            self._search_manual("warm up", max_chunks=1, similarity_threshold=0)
+        except Exception as e:
+            print(f"Warning: RAG Engine warm-up failed: {e}")
+    
+    def embed(self, text):
+        """Embedding vector for a question (a plain list of floats)"""
+        return [float(x) for x in self.embedding_function([text])[0]]
+    
+    def query(self, question, max_chunks=5, similarity_threshold=0.6, query_embedding=None):
         """Answer a question using the engineering manual"""
+        result, answer_stream = self.query_stream(question, max_chunks, similarity_threshold, query_embedding)
+        result['answer'] = "".join(answer_stream)
+        return result
+    
+    def query_stream(self, question, max_chunks=5, similarity_threshold=0.6, query_embedding=None):
+        """
+        Answer a question, streaming the answer text as Claude generates it.
+        
+        Returns (result, answer_stream): result is the query() dict without
+        'answer'; answer_stream yields the answer text in chunks and fills in
+        result['token_usage'] once it is exhausted. Pass query_embedding to
+        reuse a vector from embed() instead of embedding the question again.
+        """
         if not self.is_ready():
-            return {
-                'answer': 'System not ready. Please check configuration.',
-                'sources': [],
-                'chunks_used': 0
-            }
+            return self._fixed_answer('System not ready. Please check configuration.')
         
         try:
             # Search for relevant information
-            relevant_chunks = self._search_manual(question, max_chunks, similarity_threshold)
+            relevant_chunks = self._search_manual(question, max_chunks, similarity_threshold, query_embedding)
             
             if not relevant_chunks:
-                return {
-                    'answer': 'I could not find relevant information in the Engineering Manual to answer this question. Please try rephrasing your question or ask about a different topic.',
-                    'sources': [],
-                    'chunks_used': 0
-                }
-            
-            # Generate answer
-            answer = self._generate_answer(question, relevant_chunks)
+                return self._fixed_answer('I could not find relevant information in the Engineering Manual to answer this question. Please try rephrasing your question or ask about a different topic.')
             
             # Prepare sources
             sources = []
@@ -102,104 +149,111 @@ class RAGEngine:
                     'chunk_type': chunk.get('chunk_type', 'medium')
                 })
             
-            return {
-                'answer': answer,
+            result = {
                 'sources': sources,
                 'chunks_used': len(relevant_chunks),
-                'model_used': 'claude-sonnet-4-5-20250929',
+                'model_used': MODEL_NAME,
                 'token_usage': {'input_tokens': 0, 'output_tokens': 0}
             }
             
+            # Generate answer
+            return result, self._stream_answer(question, relevant_chunks, result)
+            
         except Exception as e:
-            return {
-                'answer': f'Error processing question: {str(e)}',
-                'sources': [],
-                'chunks_used': 0
-            }
+            return self._fixed_answer(f'Error processing question: {str(e)}')
+    
+    def _fixed_answer(self, text):
+        """Result and stream for an answer that needs no Claude call"""
+        return {'sources': [], 'chunks_used': 0}, iter([text])
     
-    def _search_manual(self, question, max_chunks, similarity_threshold):
+    def _search_manual(self, question, max_chunks, similarity_threshold, query_embedding=None):
         """Search through the manual for relevant information"""
-        all_chunks = []
+        # Embed once and search every collection with the same vector
+        if query_embedding is None:
+            query_embedding = self.embed(question)
         
-        for chunk_type, collection in self.collections.items():
-            try:
-                results = collection.query(
-                    query_texts=[question],
-                    n_results=max_chunks
-                )
-                
-                if results['documents'][0]:
-                    for i in range(len(results['documents'][0])):
-                        text = results['documents'][0][i]
-                        metadata = results['metadatas'][0][i] if results.get('metadatas') else {}
-                        
-                        distance = results['distances'][0][i] if results.get('distances') else 0
-                        similarity = max(0, 1 - (distance / 2))
-                        
-                        if similarity >= similarity_threshold:
-                            all_chunks.append({
-                                'text': text,
-                                'similarity': similarity,
-                                'chunk_type': chunk_type,
-                                'chunk_id': metadata.get('chunk_id', f'{chunk_type}_{i}'),
-                                'source': metadata.get('source', 'Engineering_Manual.docx')
-                            })
-            
-            except Exception as e:
-                print(f"Error searching {chunk_type} collection: {e}")
-                continue
+        # Collections are independent, so search them side by side
+        with ThreadPoolExecutor(max_workers=len(self.collections)) as executor:
+            per_collection = executor.map(
+                lambda item: self._search_collection(*item, query_embedding, max_chunks, similarity_threshold),
+                self.collections.items()
+            )
+            all_chunks = [chunk for chunks in per_collection for chunk in chunks]
         
         # Sort by similarity and return best ones
         all_chunks.sort(key=lambda x: x['similarity'], reverse=True)
         return all_chunks[:max_chunks]
     
-    def _generate_answer(self, question, chunks):
-        """Generate answer using Claude AI"""
+    def _search_collection(self, chunk_type, collection, query_embedding, max_chunks, similarity_threshold):
+        """Matching chunks from one collection (empty on error)"""
+        chunks = []
+        
+        try:
+            results = collection.query(
+                query_embeddings=[query_embedding],
+                n_results=max_chunks
+            )
+            
+            if results['documents'][0]:
+                for i in range(len(results['documents'][0])):
+                    text = results['documents'][0][i]
+                    metadata = results['metadatas'][0][i] if results.get('metadatas') else {}
+                    
+                    distance = results['distances'][0][i] if results.get('distances') else 0
+                    similarity = max(0, 1 - (distance / 2))
+                    
+                    if similarity >= similarity_threshold:
+                        chunks.append({
+                            'text': text,
+                            'similarity': similarity,
+                            'chunk_type': chunk_type,
+                            'chunk_id': metadata.get('chunk_id', f'{chunk_type}_{i}'),
+                            'source': metadata.get('source', 'Engineering_Manual.docx')
+                        })
+        
+        except Exception as e:
+            print(f"Error searching {chunk_type} collection: {e}")
+        
+        return chunks
+    
+    def _build_prompt(self, question, chunks):
+        """Build the per-question part of the Claude prompt from the retrieved chunks"""
         context_parts = []
         for i, chunk in enumerate(chunks, 1):
             context_parts.append(f"[SOURCE {i}]\n{chunk['text']}")
         
         full_context = "\n\n".join(context_parts)
         
-        prompt = f"""You are an expert assistant for a municipal engineering department. Answer questions using ONLY the provided context.
-
-CONTEXT FROM ENGINEERING MANUAL:
+        prompt = f"""CONTEXT FROM ENGINEERING MANUAL:
 {full_context}
 
 QUESTION: {question}
 
-You MUST respond using EXACTLY this format with these EXACT headers:
-
-ANSWER: [State the direct answer in one sentence with specific numbers/requirements]
-
-DETAILS:
-- [First supporting detail or related requirement]
-- [Second supporting detail if applicable]
-- [Additional details as needed]
-
-CODE REFERENCE: [Section number if mentioned in sources, or N/A]
-
-SOURCES: [SOURCE X, SOURCE Y]
-
-RULES:
-- Start with ANSWER: immediately - no other text before it
-- Keep the ANSWER line to 1-2 sentences maximum
-- Use simple bullet points with - for DETAILS
-- Do not use markdown formatting like ** or ## or ###
-- Do not add any headers other than ANSWER:, DETAILS:, CODE REFERENCE:, and SOURCES:
-- If information is not in the context, say: ANSWER: The Engineering Manual does not contain this information.
-
 Respond now:"""
-
+        
+        return prompt
+    
+    def _stream_answer(self, question, chunks, result):
+        """Generate answer using Claude AI, yielding text as it arrives"""
+        prompt = self._build_prompt(question, chunks)
+        
         try:
-            response = self.claude_client.messages.create(
-                model="claude-sonnet-4-5-20250929",
+            with self.claude_client.messages.stream(
+                model=MODEL_NAME,
                 max_tokens=1000,
                 temperature=0.0,
+                system=SYSTEM_PROMPT,
                 messages=[{"role": "user", "content": prompt}]
-            )
+            ) as stream:
+                for text in stream.text_stream:
+                    yield text
+                
+                usage = stream.get_final_message().usage
             
-            return response.content[0].text
+            result['token_usage'] = {
+                'input_tokens': usage.input_tokens,
+                'output_tokens': usage.output_tokens
+            }
             
         except Exception as e:
-            return f"Error generating answer: {str(e)}"
+            yield f"Error generating answer: {str(e)}"